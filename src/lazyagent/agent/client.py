@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from typing import TYPE_CHECKING
 
 from claude_agent_sdk import (
@@ -8,6 +9,8 @@ from claude_agent_sdk import (
     ClaudeSDKClient,
     HookMatcher,
     ResultMessage,
+    TextBlock,
+    query,
 )
 
 from .messages import format_message, tool_activity, tool_context
@@ -98,3 +101,32 @@ class AgentRunner:
             self._client = None
             if self._on_done:
                 self._on_done()
+
+
+async def generate_title(prompt: str) -> str:
+    """Ask a small model for a 1-3 word title; empty if it returns no text."""
+    options = ClaudeAgentOptions(
+        max_turns=1,
+        model="haiku",
+        system_prompt="Generate a 1-3 word title for the user's task. Be concise.",
+        output_format={
+            "type": "json_schema",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"}
+                },
+                "required": ["title"],
+            },
+        },
+    )
+    async for message in query(prompt=f"Summarize: {prompt}", options=options):
+        if isinstance(message, AssistantMessage):
+            for block in message.content:
+                if isinstance(block, TextBlock):
+                    text = block.text.strip()
+                    try:
+                        return json.loads(text)["title"]
+                    except (ValueError, KeyError):
+                        return text.split("\n")[0][:30]
+    return ""
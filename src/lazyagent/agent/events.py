@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import anyio
+from textual.message import Message
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+
+# Streamed output is coalesced into one panel write per frame (~60fps).
+STREAM_BATCH_S = 0.016
+
+
+class OutputUpdate(Message):
+    def __init__(self, convo_id: str, text: str) -> None:
+        super().__init__()
+        self.convo_id = convo_id
+        self.text = text
+
+
+class ActivityUpdate(Message):
+    def __init__(self, convo_id: str, activity: str) -> None:
+        super().__init__()
+        self.convo_id = convo_id
+        self.activity = activity
+
+
+class SessionIdUpdate(Message):
+    def __init__(self, convo_id: str, session_id: str) -> None:
+        super().__init__()
+        self.convo_id = convo_id
+        self.session_id = session_id
+
+
+class AgentDone(Message):
+    def __init__(self, convo_id: str) -> None:
+        super().__init__()
+        self.convo_id = convo_id
+
+
+class EventForwarder:
+    """AgentRunner callback that tags values and queues them for the pump."""
+
+    __slots__ = ("kind", "send")
+
+    def __init__(self, send: MemoryObjectSendStream[tuple[str, str]], kind: str) -> None:
+        self.send = send
+        self.kind = kind
+
+    def __call__(self, value: str = "") -> None:
+        self.send.send_nowait((self.kind, value))
+
+
+async def pump_events(
+    convo_id: str,
+    receive: MemoryObjectReceiveStream[tuple[str, str]],
+    post: Callable[[Message], object],
+) -> None:
+    """Drain runner events every STREAM_BATCH_S and post them as one batch."""
+    async with receive:
+        async for event in receive:
+            batch = [event]
+            await anyio.sleep(STREAM_BATCH_S)
+            while True:
+                try:
+                    batch.append(receive.receive_nowait())
+                except (anyio.WouldBlock, anyio.EndOfStream):
+                    break
+            _post_batch(convo_id, batch, post)
+
+
+def _post_batch(
+    convo_id: str, batch: list[tuple[str, str]], post: Callable[[Message], object]
+) -> None:
+    output: list[str] = []
+    activity = session_id = ""
+    done = False
+    for kind, value in batch:
+        if kind == "output":
+            output.append(value)
+        elif kind == "activity":
+            activity = value
+        elif kind == "session_id":
+            session_id = value
+        elif kind == "done":
+            done = True
+
+    if output:
+        post(OutputUpdate(convo_id, "".join(output)))
+    if activity:
+        post(ActivityUpdate(convo_id, activity))
+    if session_id:
+        post(SessionIdUpdate(convo_id, session_id))
+    if done:
+        post(AgentDone(convo_id))
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import functools
+from typing import TYPE_CHECKING, Any
+
 from claude_agent_sdk import (
     AssistantMessage,
     ResultMessage,
@@ -7,6 +10,9 @@ from claude_agent_sdk import (
     TextBlock,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 
 TOOL_ACTIVITIES = {
     "Read": "Reading file",
@@ -22,24 +28,48 @@ TOOL_ACTIVITIES = {
 }
 
 
+@functools.lru_cache(maxsize=256)
 def tool_activity(tool_name: str) -> str:
     return TOOL_ACTIVITIES.get(tool_name, f"Using {tool_name}")
 
 
 def tool_context(tool_name: str, tool_input: dict) -> str:
     """Extract a short context string from tool input."""
-    if tool_name == "Bash":
-        return tool_input.get("description", "") or _truncate(
-            tool_input.get("command", ""), 50
-        )
-    if tool_name in ("Read", "Edit", "Write"):
-        fp = tool_input.get("file_path", "")
-        return fp.rsplit("/", 1)[-1] if "/" in fp else fp
-    if tool_name in ("Grep", "Glob"):
-        return _truncate(tool_input.get("pattern", ""), 40)
-    if tool_name == "Task":
-        return _truncate(tool_input.get("description", ""), 40)
-    return ""
+    fields = _CTX_FIELDS.get(tool_name)
+    if fields is None:
+        return ""
+    return _tool_context_cached(tool_name, tuple(tool_input.get(f, "") for f in fields))
+
+
+@functools.lru_cache(maxsize=2048)
+def _tool_context_cached(tool_name: str, key: tuple[str, ...]) -> str:
+    return _CTX_EXTRACTORS[tool_name](*key)
+
+
+def _file_basename(file_path: str) -> str:
+    return file_path.rsplit("/", 1)[-1]
+
+
+# Input fields read per tool, passed positionally to its extractor.
+_CTX_FIELDS: dict[str, tuple[str, ...]] = {
+    "Bash": ("description", "command"),
+    "Read": ("file_path",),
+    "Edit": ("file_path",),
+    "Write": ("file_path",),
+    "Grep": ("pattern",),
+    "Glob": ("pattern",),
+    "Task": ("description",),
+}
+
+_CTX_EXTRACTORS: dict[str, Callable[..., str]] = {
+    "Bash": lambda description, command: description or _truncate(command, 50),
+    "Read": _file_basename,
+    "Edit": _file_basename,
+    "Write": _file_basename,
+    "Grep": lambda pattern: _truncate(pattern, 40),
+    "Glob": lambda pattern: _truncate(pattern, 40),
+    "Task": lambda description: _truncate(description, 40),
+}
 
 
 def format_message(message: object) -> tuple[str, str]:
@@ -48,24 +78,24 @@ def format_message(message: object) -> tuple[str, str]:
     Returns a tuple of (text to append to output, activity string for status bar).
     Tool invocations are handled by PreToolUse hooks, not here.
     """
-    if isinstance(message, AssistantMessage):
-        parts: list[str] = []
-        activity = ""
-        for block in message.content:
-            if isinstance(block, TextBlock):
-                parts.append(block.text)
-                activity = "Writing"
-        return "\n".join(parts), activity
+    handler = _MSG_HANDLERS.get(type(message))
+    return handler(message) if handler else ("", "")
+
 
-    if isinstance(message, SystemMessage):
-        return "", "Initializing"
+def _format_assistant(message: AssistantMessage) -> tuple[str, str]:
+    parts = [block.text for block in message.content if type(block) is TextBlock]
+    return "\n".join(parts), "Writing" if parts else ""
 
-    if isinstance(message, ResultMessage):
-        return "", ""
 
-    return "", ""
+# Keyed on exact type; the SDK's message classes are not subclassed.
+_MSG_HANDLERS: dict[type, Callable[[Any], tuple[str, str]]] = {
+    AssistantMessage: _format_assistant,
+    SystemMessage: lambda _: ("", "Initializing"),
+    ResultMessage: lambda _: ("", ""),
+}
 
 
+@functools.lru_cache(maxsize=1024)
 def _truncate(s: str, max_len: int) -> str:
     s = s.split("\n")[0]
     if len(s) > max_len:
@@ -1,51 +1,44 @@
 from __future__ import annotations
 
+import math
 import os
 
 import anyio
 from rich.syntax import Syntax
 from rich.text import Text
-from textual import work
+from textual import events, work
 from textual.app import App, ComposeResult
 from textual.binding import Binding
-from textual.message import Message
 from textual.theme import Theme
-
-from claude_agent_sdk import AssistantMessage, TextBlock, query, ClaudeAgentOptions
-
-from .agent.client import AgentRunner
+from textual.timer import Timer
+
+from .agent.client import AgentRunner, generate_title
+from .agent.events import (
+    STREAM_BATCH_S,
+    ActivityUpdate,
+    AgentDone,
+    EventForwarder,
+    OutputUpdate,
+    SessionIdUpdate,
+    pump_events,
+)
+from .git import iter_patches, open_git, read_output
 from .state.models import AppState, Conversation, Status
-from .state.persist import delete_log, load_state, save_state
+from .state.persist import (
+    SaveScheduler,
+    delete_log,
+    ensure_output,
+    load_state,
+    save_state,
+)
 from .widgets.output_panel import OutputPanel
 from .widgets.prompt_input import PromptInput
 from .widgets.tree_panel import TreePanel
 
-
-class OutputUpdate(Message):
-    def __init__(self, convo_id: str, text: str) -> None:
-        super().__init__()
-        self.convo_id = convo_id
-        self.text = text
-
-
-class ActivityUpdate(Message):
-    def __init__(self, convo_id: str, activity: str) -> None:
-        super().__init__()
-        self.convo_id = convo_id
-        self.activity = activity
-
-
-class SessionIdUpdate(Message):
-    def __init__(self, convo_id: str, session_id: str) -> None:
-        super().__init__()
-        self.convo_id = convo_id
-        self.session_id = session_id
-
-
-class AgentDone(Message):
-    def __init__(self, convo_id: str) -> None:
-        super().__init__()
-        self.convo_id = convo_id
+# Selecting a conversation renders at most this much of its history.
+MAX_VISIBLE_CHARS = 200_000
+# Elapsed labels have minute granularity, so a slow poll is plenty.
+ELAPSED_REFRESH_S = 5.0
 
 
 class LazyAgentApp(App[None]):
@@ -65,9 +58,20 @@ class LazyAgentApp(App[None]):
         self.register_theme(_CATPPUCCIN_MOCHA)
         self.theme = "catppuccin-mocha"
         self.state: AppState = load_state(os.getcwd())
+        self._convo_index: dict[str, Conversation] = {}
+        self._convo_pos: dict[str, tuple[int, int]] = {}
+        self._proj_pos: dict[str, int] = {}
+        self._rebuild_index()
         self._runners: dict[str, AgentRunner] = {}
         self._output_mode: int = 1
         self._pending_mode: str = "build"
+        self._pending_output: dict[str, list[str]] = {}
+        self._pending_activity: dict[str, str] = {}
+        self._flush_timer: Timer | None = None
+        self._visible_convo_id: str | None = None
+        self._dirty: set[str] = set()
+        self._tree_version: int = -1
+        self._saver: SaveScheduler | None = None
 
     def compose(self) -> ComposeResult:
         yield TreePanel()
@@ -75,82 +79,130 @@ class LazyAgentApp(App[None]):
         yield PromptInput()
 
     def on_mount(self) -> None:
-        self.query_one(OutputPanel).border_title = _output_mode_title(1)
+        self._output_panel: OutputPanel = self.query_one(OutputPanel)
+        self._tree_panel: TreePanel = self.query_one(TreePanel)
+        self._prompt: PromptInput = self.query_one(PromptInput)
+        self._output_panel.border_title = _output_mode_title(1)
         self._refresh_all()
-        self.query_one(PromptInput).focus()
-        self.set_interval(1.0, self._tick)
+        self._prompt.focus()
+        self.set_interval(ELAPSED_REFRESH_S, self._tick)
+        self._saver = SaveScheduler(self.state)
+        self.run_worker(self._saver.run(), exclusive=True, group="save")
+
+    def _request_save(self) -> None:
+        if self._saver is not None:
+            self._saver.request()
 
     def _tick(self) -> None:
-        self._refresh_status()
-        self.query_one(TreePanel).update_labels(self.state)
+        # Everything else refreshes on events; this only keeps elapsed times
+        # moving while an agent runs.
+        if any(c.is_active() for c in self._convo_index.values()):
+            self._schedule_refresh("status", "tree")
 
     def _refresh_all(self) -> None:
-        self._refresh_tree()
+        self._rebuild_tree()
         self._refresh_output()
         self._refresh_status()
         self._refresh_prompt_mode()
 
+    def _schedule_refresh(self, *kinds: str) -> None:
+        """Coalesce refresh requests into a single pass after the current event."""
+        if not self._dirty:
+            self.call_later(self._do_refresh)
+        self._dirty.update(kinds)
+
+    def _do_refresh(self) -> None:
+        dirty, self._dirty = self._dirty, set()
+        if "tree" in dirty:
+            self._refresh_tree()
+        if "output" in dirty:
+            self._refresh_output()
+        if "status" in dirty:
+            self._refresh_status()
+        if "prompt" in dirty:
+            self._refresh_prompt_mode()
+
     def _refresh_tree(self) -> None:
-        self.query_one(TreePanel).rebuild(self.state)
+        """Rebuild on structural changes, otherwise only update labels."""
+        if self.state.version != self._tree_version:
+            self._rebuild_tree()
+        else:
+            self._tree_panel.update_labels(self.state)
+
+    def _rebuild_tree(self) -> None:
+        self._tree_panel.rebuild(self.state)
+        self._tree_version = self.state.version
 
     def _refresh_output(self) -> None:
+        convo = self.state.selected_conversation()
+        self._visible_convo_id = convo.id if convo else None
         if self._output_mode != 1:
             return
-        panel = self.query_one(OutputPanel)
-        convo = self.state.selected_conversation()
+        panel = self._output_panel
         if convo is None:
             panel.set_output("")
         else:
-            panel.set_output(convo.output)
+            ensure_output(convo)
+            text, truncated = convo.output_tail(MAX_VISIBLE_CHARS)
+            panel.set_output(text, truncated)
 
     def _refresh_status(self) -> None:
-        self.query_one(PromptInput).set_status(self.state.selected_conversation())
+        self._prompt.set_status(self.state.selected_conversation())
 
     def _refresh_prompt_mode(self) -> None:
         convo = self.state.selected_conversation()
         mode = convo.mode if convo else self._pending_mode
-        self.query_one(PromptInput).set_mode(mode)
+        self._prompt.set_mode(mode)
 
 
     def _set_output_mode(self, mode: int) -> None:
         self._output_mode = mode
-        panel = self.query_one(OutputPanel)
+        panel = self._output_panel
         panel.border_title = _output_mode_title(mode)
         if mode == 1:
             self._refresh_output()
         elif mode == 2:
             self._show_git_diff()
 
-    @work(thread=False)
+    @work(thread=False, exclusive=True, group="diff")
     async def _show_git_diff(self) -> None:
         proj = self.state.current_project()
         cwd = proj.path if proj else os.getcwd()
-        panel = self.query_one(OutputPanel)
+        panel = self._output_panel
         panel.clear()
 
         try:
-            result_status = await anyio.run_process(
-                ["git", "status", "--short"], cwd=cwd
-            )
-            result_diff = await anyio.run_process(
-                ["git", "diff"], cwd=cwd
-            )
-            status_text = result_status.stdout.decode().rstrip("\n")
-            diff_text = result_diff.stdout.decode().rstrip("\n")
-
-            if not status_text and not diff_text:
-                panel.write(Text("No changes", style="dim"))
-                return
+            # Both commands start right away; status is read first so its
+            # section lands above the diff, which then paints patch by patch.
+            async with (
+                await open_git(cwd, "status", "--short") as status_proc,
+                await open_git(cwd, "diff") as diff_proc,
+            ):
+                status_text = await read_output(status_proc)
+                # Every write follows an await; stop once the user has
+                # switched back to the Output view.
+                if self._output_mode != 2:
+                    return
+                if status_text:
+                    panel.write(Text.from_ansi("\x1b[36m── git status ──\x1b[0m"))
+                    panel.write(Text(status_text))
 
-            if status_text:
-                panel.write(Text.from_ansi("\x1b[36m── git status ──\x1b[0m"))
-                panel.write(Text(status_text))
+                has_diff = False
+                async for patch in iter_patches(diff_proc):
+                    if self._output_mode != 2:
+                        return
+                    if not has_diff:
+                        panel.write(Text.from_ansi("\x1b[36m── git diff ──\x1b[0m"))
+                        has_diff = True
+                    panel.write(Syntax(patch, "diff", theme="monokai", line_numbers=False))
 
-            if diff_text:
-                panel.write(Text.from_ansi("\x1b[36m── git diff ──\x1b[0m"))
-                panel.write(Syntax(diff_text, "diff", theme="monokai", line_numbers=False))
+            if self._output_mode != 2:
+                return
+            if not status_text and not has_diff:
+                panel.write(Text("No changes", style="dim"))
         except Exception as e:
-            panel.write(Text.from_ansi(f"\x1b[31m[Error] {e}\x1b[0m"))
+            if self._output_mode == 2:
+                panel.write(Text.from_ansi(f"\x1b[31m[Error] {e}\x1b[0m"))
 
 
     def action_quit_if_tree(self) -> None:
@@ -158,8 +210,8 @@ class LazyAgentApp(App[None]):
             self.exit()
 
     def action_switch_focus(self) -> None:
-        tree = self.query_one(TreePanel)
-        prompt = self.query_one(PromptInput)
+        tree = self._tree_panel
+        prompt = self._prompt
         if self.focused is tree:
             self.state.tree_focused = False
             prompt.focus()
@@ -175,44 +227,37 @@ class LazyAgentApp(App[None]):
         else:
             convo.mode = "plan" if convo.mode == "build" else "build"
             new_mode = convo.mode
-            save_state(self.state)
-        self.query_one(PromptInput).set_mode(new_mode)
+            self._request_save()
+        self._prompt.set_mode(new_mode)
 
     def action_new_conversation(self) -> None:
         proj = self.state.current_project()
         if proj is not None:
             proj.selected = -1
         self.state.tree_focused = False
-        self.query_one(PromptInput).focus()
+        self._prompt.focus()
         self._refresh_all()
 
 
     def on_tree_node_highlighted(self, event: TreePanel.NodeHighlighted) -> None:
-        node = event.node
-        data = node.data or ""
-        if data.startswith("convo:"):
-            convo_id = data.split(":", 1)[1]
-            for i, proj in enumerate(self.state.projects):
-                for j, convo in enumerate(proj.convos):
-                    if convo.id == convo_id:
-                        self.state.selected_proj = i
-                        proj.selected = j
-                        self._refresh_output()
-                        self._refresh_status()
-                        self._refresh_prompt_mode()
-                        return
-        elif data.startswith("proj:"):
-            proj_path = data.split(":", 1)[1]
-            for i, proj in enumerate(self.state.projects):
-                if proj.path == proj_path:
-                    self.state.selected_proj = i
-                    proj.selected = -1
-                    self._refresh_output()
-                    self._refresh_status()
-                    self._refresh_prompt_mode()
-                    return
+        if event.node.data is None:
+            return
+        kind, key = event.node.data
+        if kind == "convo":
+            pos = self._convo_pos.get(key)
+            if pos is None:
+                return
+            i, j = pos
+        else:
+            i = self._proj_pos.get(key, -1)
+            if i == -1:
+                return
+            j = -1
+        self.state.selected_proj = i
+        self.state.projects[i].selected = j
+        self._schedule_refresh("output", "status", "prompt")
 
-    def on_key(self, event) -> None:
+    def on_key(self, event: events.Key) -> None:
         if event.key == "shift+tab":
             if self.focused and self.focused.id == "prompt-input":
                 self._toggle_mode()
@@ -232,7 +277,7 @@ class LazyAgentApp(App[None]):
                 return
 
         if self.focused and self.focused.id == "tree-panel":
-            tree = self.query_one(TreePanel)
+            tree = self._tree_panel
             if event.key == "j":
                 tree.action_cursor_down()
                 event.prevent_default()
@@ -256,9 +301,10 @@ class LazyAgentApp(App[None]):
         if not prompt:
             return
 
-        self.query_one(PromptInput).value = ""
+        self._prompt.value = ""
+        was_output = self._output_mode == 1
         self._output_mode = 1
-        self.query_one(OutputPanel).border_title = _output_mode_title(1)
+        self._output_panel.border_title = _output_mode_title(1)
 
         convo = self.state.selected_conversation()
 
@@ -267,15 +313,23 @@ class LazyAgentApp(App[None]):
             convo = self.state.new_conversation(prompt)
             if convo is None:
                 return
+            self._rebuild_index()
             convo.mode = self._pending_mode
-            convo.output = f"\x1b[36m▶ {prompt}\x1b[0m\n"
+            convo.output_chunks = [f"\x1b[36m▶ {prompt}\x1b[0m\n"]
         else:
-            convo.output += f"\n\x1b[36m▶ {prompt}\x1b[0m\n"
+            ensure_output(convo)
+            convo.output_chunks.append(f"\n\x1b[36m▶ {prompt}\x1b[0m\n")
             convo.status = Status.RUNNING
 
         convo.activity = "Starting"
-        self._refresh_all()
-        save_state(self.state)
+        if is_new or not was_output:
+            self._refresh_all()
+        else:
+            # The panel already shows this convo; add the marker instead of
+            # re-parsing the whole history.
+            self._output_panel.append_prompt(prompt)
+            self._schedule_refresh("tree", "status")
+        self._request_save()
 
         self._spawn_agent(convo, prompt)
         if is_new:
@@ -284,19 +338,11 @@ class LazyAgentApp(App[None]):
     @work(thread=False)
     async def _spawn_agent(self, convo: Conversation, prompt: str) -> None:
         convo_id = convo.id
-        app = self.app
-
-        def on_output(text: str) -> None:
-            app.post_message(OutputUpdate(convo_id, text))
-
-        def on_activity(activity: str) -> None:
-            app.post_message(ActivityUpdate(convo_id, activity))
-
-        def on_session_id(sid: str) -> None:
-            app.post_message(SessionIdUpdate(convo_id, sid))
+        send, receive = anyio.create_memory_object_stream[tuple[str, str]](math.inf)
+        self.run_worker(pump_events(convo_id, receive, self.post_message))
 
-        def on_done() -> None:
-            app.post_message(AgentDone(convo_id))
+        on_output = EventForwarder(send, "output")
+        on_done = EventForwarder(send, "done")
 
         permission_mode = "plan" if convo.mode == "plan" else "bypassPermissions"
         runner = AgentRunner(
@@ -304,73 +350,69 @@ class LazyAgentApp(App[None]):
             session_id=convo.session_id,
             permission_mode=permission_mode,
             on_output=on_output,
-            on_activity=on_activity,
-            on_session_id=on_session_id,
+            on_activity=EventForwarder(send, "activity"),
+            on_session_id=EventForwarder(send, "session_id"),
             on_done=on_done,
         )
         self._runners[convo_id] = runner
 
-        try:
-            await runner.run(prompt)
-        except Exception as e:
-            app.post_message(
-                OutputUpdate(convo_id, f"\x1b[31m[Error] {e}\x1b[0m\n")
-            )
-            app.post_message(AgentDone(convo_id))
-
+        with send:
+            try:
+                await runner.run(prompt)
+            except Exception as e:
+                on_output(f"\x1b[31m[Error] {e}\x1b[0m\n")
+                on_done()
 
     @work(thread=False)
     async def _generate_title(self, convo: Conversation) -> None:
-        import json as _json
-
         try:
-            options = ClaudeAgentOptions(
-                max_turns=1,
-                model="haiku",
-                system_prompt="Generate a 1-3 word title for the user's task. Be concise.",
-                output_format={
-                    "type": "json_schema",
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "title": {"type": "string"}
-                        },
-                        "required": ["title"],
-                    },
-                },
-            )
-            async for message in query(
-                prompt=f"Summarize: {convo.prompt}", options=options
-            ):
-                if isinstance(message, AssistantMessage):
-                    for block in message.content:
-                        if isinstance(block, TextBlock):
-                            text = block.text.strip()
-                            try:
-                                convo.title = _json.loads(text)["title"]
-                            except (ValueError, KeyError):
-                                convo.title = text.split("\n")[0][:30]
-                            self._refresh_tree()
-                            save_state(self.state)
-                            return
+            title = await generate_title(convo.prompt)
         except Exception:
-            pass
+            return
+        if title:
+            convo.title = title
+            self._schedule_refresh("tree")
+            self._request_save()
 
 
     def on_output_update(self, event: OutputUpdate) -> None:
-        convo = self._find_convo(event.convo_id)
-        if convo is None:
-            return
-        convo.output += event.text
-        if self._output_mode == 1 and self.state.selected_conversation() is convo:
-            self.query_one(OutputPanel).append_text(event.text)
+        self._pending_output.setdefault(event.convo_id, []).append(event.text)
+        self._schedule_flush()
 
     def on_activity_update(self, event: ActivityUpdate) -> None:
-        convo = self._find_convo(event.convo_id)
-        if convo is None:
-            return
-        convo.activity = event.activity
-        if self.state.selected_conversation() is convo:
+        self._pending_activity[event.convo_id] = event.activity
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self._flush_timer is None:
+            self._flush_timer = self.set_timer(STREAM_BATCH_S, self._flush_output)
+
+    def _flush_output(self) -> None:
+        """Apply buffered output/activity updates with one write per convo."""
+        if self._flush_timer is not None:
+            self._flush_timer.stop()
+            self._flush_timer = None
+
+        visible = self._visible_convo_id if self._output_mode == 1 else None
+        for convo_id, chunks in self._pending_output.items():
+            convo = self._find_convo(convo_id)
+            if convo is None:
+                continue
+            joined = "".join(chunks)
+            convo.output_chunks.append(joined)
+            if convo_id == visible:
+                self._output_panel.append_text(joined)
+        self._pending_output.clear()
+
+        refresh_status = False
+        for convo_id, activity in self._pending_activity.items():
+            convo = self._find_convo(convo_id)
+            if convo is None:
+                continue
+            convo.activity = activity
+            refresh_status = refresh_status or convo_id == self._visible_convo_id
+        self._pending_activity.clear()
+        if refresh_status:
             self._refresh_status()
 
     def on_session_id_update(self, event: SessionIdUpdate) -> None:
@@ -379,13 +421,14 @@ class LazyAgentApp(App[None]):
             convo.session_id = event.session_id
 
     def on_agent_done(self, event: AgentDone) -> None:
+        self._flush_output()
         convo = self._find_convo(event.convo_id)
         if convo is not None:
             convo.status = Status.IDLE
             convo.activity = ""
         self._runners.pop(event.convo_id, None)
-        self._refresh_all()
-        save_state(self.state)
+        self._schedule_refresh("tree", "status")
+        self._request_save()
 
 
     def _delete_conversation(self) -> None:
@@ -393,17 +436,27 @@ class LazyAgentApp(App[None]):
         if convo is None:
             return
         self._runners.pop(convo.id, None)
-        delete_log(convo.id)
+        self._pending_output.pop(convo.id, None)
+        self._pending_activity.pop(convo.id, None)
         self.state.delete_selected_conversation()
+        delete_log(convo.id)
+        self._rebuild_index()
         self._refresh_all()
-        save_state(self.state)
+        self._request_save()
 
     def _find_convo(self, convo_id: str) -> Conversation | None:
-        for proj in self.state.projects:
-            for convo in proj.convos:
-                if convo.id == convo_id:
-                    return convo
-        return None
+        return self._convo_index.get(convo_id)
+
+    def _rebuild_index(self) -> None:
+        """Re-map ids to conversations and tree positions after add/remove."""
+        self._convo_index.clear()
+        self._convo_pos.clear()
+        self._proj_pos.clear()
+        for i, proj in enumerate(self.state.projects):
+            self._proj_pos[proj.path] = i
+            for j, convo in enumerate(proj.convos):
+                self._convo_index[convo.id] = convo
+                self._convo_pos[convo.id] = (i, j)
 
     def _on_exit_app(self) -> None:
         save_state(self.state)
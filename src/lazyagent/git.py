@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import subprocess
+from typing import TYPE_CHECKING
+
+import anyio
+from anyio.streams.text import TextReceiveStream
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from anyio.abc import Process
+
+
+async def open_git(cwd: str, *args: str) -> Process:
+    """Start a git command; pair with read_output/iter_patches to consume it."""
+    return await anyio.open_process(
+        ["git", *args],
+        cwd=cwd,
+        stdin=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def read_output(process: Process) -> str:
+    """Read a git process's full stdout, raising if it exits non-zero."""
+    parts: list[str] = []
+    if process.stdout is not None:
+        async for text in TextReceiveStream(process.stdout, errors="replace"):
+            parts.append(text)
+    await _check(process)
+    return "".join(parts).rstrip("\n")
+
+
+async def iter_patches(process: Process) -> AsyncIterator[str]:
+    """Yield `git diff` output one file patch at a time as it is read."""
+    partial = ""
+    patch: list[str] = []
+    if process.stdout is not None:
+        async for text in TextReceiveStream(process.stdout, errors="replace"):
+            lines = (partial + text).split("\n")
+            partial = lines.pop()
+            for line in lines:
+                if line.startswith("diff --git ") and patch:
+                    yield "\n".join(patch)
+                    patch = []
+                patch.append(line)
+    if partial:
+        patch.append(partial)
+    await _check(process)
+    if patch:
+        yield "\n".join(patch)
+
+
+async def _check(process: Process) -> None:
+    returncode = await process.wait()
+    if returncode:
+        raise RuntimeError(f"git exited with status {returncode}")
@@ -2,8 +2,8 @@ from __future__ import annotations
 
 import os
 import secrets
+import time
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
 from enum import Enum
 
 
@@ -18,26 +18,51 @@ class Conversation:
     id: str
     prompt: str
     status: Status = Status.IDLE
-    start_time: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    start_ts: float = field(default_factory=time.time)
     title: str = ""
     session_id: str = ""
     activity: str = ""
-    output: str = ""
+    output_chunks: list[str] = field(default_factory=list)
     mode: str = "build"
+    # False until the persisted log has been read into output_chunks.
+    output_loaded: bool = field(default=True, repr=False, compare=False)
+    # Number of output_chunks already written to the log file.
+    persisted_chunks: int = field(default=0, init=False, repr=False, compare=False)
+    _elapsed_cache: tuple[int, str] = field(
+        default=(-1, ""), init=False, repr=False, compare=False
+    )
+
+    @property
+    def output(self) -> str:
+        return "".join(self.output_chunks)
+
+    def output_tail(self, max_chars: int) -> tuple[str, bool]:
+        """Return (text, truncated) for at most max_chars of trailing output.
+
+        Only the chunks needed to cover the tail are joined. A cut tail starts
+        at the next line boundary so no ANSI sequence is split.
+        """
+        chunks = self.output_chunks
+        start = len(chunks)
+        size = 0
+        while start > 0 and size <= max_chars:
+            start -= 1
+            size += len(chunks[start])
+        if size <= max_chars:
+            return "".join(chunks), False
+        # One extra char tells whether the cut already falls on a line start.
+        text = "".join(chunks[start:])[-(max_chars + 1) :]
+        nl = text.find("\n")
+        return (text[nl + 1 :] if nl != -1 else text[1:]), True
 
     def is_active(self) -> bool:
         return self.status == Status.RUNNING
 
     def elapsed(self) -> str:
-        delta = datetime.now(timezone.utc) - self.start_time
-        minutes = int(delta.total_seconds() // 60)
-        if minutes < 1:
-            return "<1m"
-        if minutes < 60:
-            return f"{minutes}m"
-        hours = minutes // 60
-        remaining = minutes % 60
-        return f"{hours}h{remaining}m"
+        minutes = max(0, int(time.time() - self.start_ts) // 60)
+        if minutes != self._elapsed_cache[0]:
+            self._elapsed_cache = (minutes, _format_minutes(minutes))
+        return self._elapsed_cache[1]
 
 
 @dataclass
@@ -47,6 +72,13 @@ class Project:
     expanded: bool = True
     convos: list[Conversation] = field(default_factory=list)
     selected: int = -1
+    # Index over convos; kept in step by AppState and load_state.
+    convos_by_id: dict[str, Conversation] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self.convos_by_id = {c.id: c for c in self.convos}
 
 
 @dataclass
@@ -54,6 +86,23 @@ class AppState:
     projects: list[Project] = field(default_factory=list)
     selected_proj: int = 0
     tree_focused: bool = False
+    # Bumped on structural changes (add/remove/expand) so views can tell
+    # a full tree rebuild apart from a label refresh.
+    version: int = 0
+    projects_by_path: dict[str, Project] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self.projects_by_path = {p.path: p for p in self.projects}
+
+    def add_project(self, proj: Project, index: int | None = None) -> None:
+        if index is None:
+            self.projects.append(proj)
+        else:
+            self.projects.insert(index, proj)
+        self.projects_by_path[proj.path] = proj
+        self.version += 1
 
     def current_project(self) -> Project | None:
         if not self.projects:
@@ -76,8 +125,10 @@ class AppState:
             status=Status.RUNNING,
         )
         proj.convos.append(convo)
+        proj.convos_by_id[convo.id] = convo
         proj.selected = len(proj.convos) - 1
         proj.expanded = True
+        self.version += 1
         return convo
 
     def delete_selected_conversation(self) -> Conversation | None:
@@ -86,13 +137,14 @@ class AppState:
             return None
         idx = proj.selected
         convo = proj.convos.pop(idx)
+        proj.convos_by_id.pop(convo.id, None)
+        self.version += 1
         if not proj.convos:
             proj.selected = -1
         elif proj.selected >= len(proj.convos):
             proj.selected = len(proj.convos) - 1
         return convo
 
-
     def _tree_item_count(self) -> int:
         count = 0
         for proj in self.projects:
@@ -142,6 +194,7 @@ class AppState:
         proj = self.current_project()
         if proj is not None and proj.selected == -1:
             proj.expanded = not proj.expanded
+            self.version += 1
 
 
 def load_initial_state(cwd: str) -> AppState:
@@ -150,10 +203,25 @@ def load_initial_state(cwd: str) -> AppState:
         projects=[
             Project(
                 path=cwd,
-                name=os.path.basename(cwd),
+                name=project_name(cwd),
                 expanded=True,
                 selected=-1,
             )
         ],
         selected_proj=0,
     )
+
+
+def project_name(path: str) -> str:
+    """Last path component, ignoring a trailing separator."""
+    return path.rstrip(os.sep).rsplit(os.sep, 1)[-1] or path
+
+
+def _format_minutes(minutes: int) -> str:
+    if minutes < 1:
+        return "<1m"
+    if minutes < 60:
+        return f"{minutes}m"
+    hours = minutes // 60
+    remaining = minutes % 60
+    return f"{hours}h{remaining}m"
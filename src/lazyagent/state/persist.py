@@ -2,40 +2,54 @@ from __future__ import annotations
 
 import json
 import os
-from datetime import datetime, timezone
+import threading
+from datetime import datetime
 from pathlib import Path
 
-from .models import AppState, Conversation, Project, Status
+import anyio
 
+from .models import AppState, Conversation, Project, Status, project_name
 
-def _state_dir() -> Path:
-    home = Path.home()
-    return home / ".local" / "state" / "lazyagent"
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
-def _logs_dir() -> Path:
-    return _state_dir() / "logs"
+_STATE_DIR = Path.home() / ".local" / "state" / "lazyagent"
+_LOGS_DIR = _STATE_DIR / "logs"
+_STATE_PATH = _STATE_DIR / "state.json"
 
+_STATUS_BY_VALUE = {s.value: s for s in Status}
 
-def _state_path() -> Path:
-    return _state_dir() / "state.json"
+# save_state runs in a worker thread; this keeps it from overlapping the exit
+# save or a log deletion on the UI thread.
+_save_lock = threading.Lock()
+
+# Saves requested within this window are coalesced into one write.
+SAVE_DEBOUNCE_S = 0.5
 
 
 def _log_path(convo_id: str) -> Path:
-    return _logs_dir() / f"{convo_id}.log"
+    return _LOGS_DIR / f"{convo_id}.log"
 
 
 def _ensure_dirs() -> None:
-    _state_dir().mkdir(parents=True, exist_ok=True)
-    _logs_dir().mkdir(parents=True, exist_ok=True)
+    _LOGS_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def delete_log(convo_id: str) -> None:
-    path = _log_path(convo_id)
-    path.unlink(missing_ok=True)
+    """Remove a log; call after the convo has left its project."""
+    with _save_lock:
+        _log_path(convo_id).unlink(missing_ok=True)
 
 
 def save_state(state: AppState) -> None:
+    with _save_lock:
+        _save_state(state)
+
+
+def _save_state(state: AppState) -> None:
     _ensure_dirs()
 
     data: dict = {"selected_project": state.selected_proj, "projects": []}
@@ -56,20 +70,95 @@ def save_state(state: AppState) -> None:
                     "title": convo.title,
                     "status": convo.status.value,
                     "mode": convo.mode,
-                    "start_time": convo.start_time.isoformat(),
+                    "start_ts": convo.start_ts,
                 }
             )
-            _log_path(convo.id).write_text(convo.output)
+            if not convo.output_loaded:
+                continue
+            _save_log(proj, convo)
         data["projects"].append(proj_data)
 
-    _state_path().write_text(json.dumps(data, indent=2))
+    # Write to a sibling temp file and rename so a crash mid-write never
+    # leaves a truncated state.json behind.
+    tmp = _STATE_PATH.with_suffix(".json.tmp")
+    tmp.write_bytes(_dumps(data))
+    os.replace(tmp, _STATE_PATH)
+
+
+async def save_state_async(state: AppState) -> None:
+    """Run save_state in a worker thread so the event loop keeps running."""
+    await anyio.to_thread.run_sync(save_state, state)
+
+
+class SaveScheduler:
+    """Debounced background saves; construct inside the running event loop."""
+
+    def __init__(self, state: AppState) -> None:
+        self.state = state
+        self._requested = anyio.Event()
+
+    def request(self) -> None:
+        self._requested.set()
+
+    async def run(self) -> None:
+        while True:
+            await self._requested.wait()
+            await anyio.sleep(SAVE_DEBOUNCE_S)
+            # Requests made while this save runs land on the fresh event.
+            self._requested = anyio.Event()
+            await save_state_async(self.state)
+
+
+def ensure_output(convo: Conversation) -> None:
+    """Read a loaded conversation's log into memory on first use."""
+    if convo.output_loaded:
+        return
+    try:
+        output = _log_path(convo.id).read_text()
+    except FileNotFoundError:
+        output = ""
+    if output:
+        convo.output_chunks.insert(0, output)
+    convo.persisted_chunks = 1 if output else 0
+    convo.output_loaded = True
+
+
+def _save_log(proj: Project, convo: Conversation) -> None:
+    """Append chunks added since the last save; rewrite if output was reset."""
+    if convo.id not in proj.convos_by_id:
+        # Deleted since this save started; writing would orphan the log.
+        return
+    chunks = convo.output_chunks
+    count = len(chunks)
+    persisted = convo.persisted_chunks
+    if count == persisted:
+        return
+    if count < persisted:
+        persisted = 0
+    mode = "a" if persisted else "w"
+    with _log_path(convo.id).open(mode) as f:
+        f.write("".join(chunks[persisted:count]))
+    convo.persisted_chunks = count
+
+
+def _dumps(data: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+
+def _loads(data: bytes) -> dict:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError.
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def load_state(current_path: str) -> AppState:
     state = AppState(projects=[], selected_proj=0)
 
     try:
-        raw = json.loads(_state_path().read_text())
+        raw = _loads(_STATE_PATH.read_bytes())
     except (FileNotFoundError, json.JSONDecodeError):
         return _new_state_with_project(current_path)
 
@@ -81,12 +170,7 @@ def load_state(current_path: str) -> AppState:
             selected=-1,
         )
         for cd in pd.get("conversations", []):
-            output = ""
-            try:
-                output = _log_path(cd["id"]).read_text()
-            except FileNotFoundError:
-                pass
-            status = Status(cd.get("status", "I"))
+            status = _STATUS_BY_VALUE.get(cd.get("status"), Status.IDLE)
             if status == Status.RUNNING:
                 status = Status.IDLE
             convo = Conversation(
@@ -94,43 +178,47 @@ def load_state(current_path: str) -> AppState:
                 session_id=cd.get("session_id", ""),
                 prompt=cd["prompt"],
                 title=cd.get("title", ""),
-                output=output,
+                output_loaded=False,
                 status=status,
-                start_time=datetime.fromisoformat(cd["start_time"]),
+                start_ts=_start_ts(cd),
                 mode=cd.get("mode", "build"),
             )
             proj.convos.append(convo)
-        state.projects.append(proj)
-
-    found = -1
-    for i, proj in enumerate(state.projects):
-        if proj.path == current_path:
-            found = i
-            break
+            proj.convos_by_id[convo.id] = convo
+        state.add_project(proj)
 
-    if found == -1:
-        state.projects.insert(
-            0,
+    current = state.projects_by_path.get(current_path)
+    if current is None:
+        state.add_project(
             Project(
                 path=current_path,
-                name=os.path.basename(current_path),
+                name=project_name(current_path),
                 expanded=True,
                 selected=-1,
             ),
+            index=0,
         )
         state.selected_proj = 0
     else:
-        state.selected_proj = found
+        state.selected_proj = state.projects.index(current)
 
     return state
 
 
+def _start_ts(cd: dict) -> float:
+    ts = cd.get("start_ts")
+    if ts is not None:
+        return ts
+    # state.json written before start_ts stored an ISO start_time.
+    return datetime.fromisoformat(cd["start_time"]).timestamp()
+
+
 def _new_state_with_project(path: str) -> AppState:
     return AppState(
         projects=[
             Project(
                 path=path,
-                name=os.path.basename(path),
+                name=project_name(path),
                 expanded=True,
                 selected=-1,
             )
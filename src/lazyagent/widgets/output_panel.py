@@ -1,13 +1,9 @@
 from __future__ import annotations
 
-import re
-
 from rich.markdown import Markdown
 from rich.text import Text
 from textual.widgets import RichLog
 
-_ANSI_RE = re.compile(r"\x1b\[")
-
 
 class OutputPanel(RichLog):
     """Agent output display with markdown and ANSI support."""
@@ -23,8 +19,17 @@ class OutputPanel(RichLog):
             auto_scroll=True,
         )
 
-    def set_output(self, text: str) -> None:
+    def set_output(self, text: str, truncated: bool = False) -> None:
         self.clear()
+        if truncated:
+            self.write(Text("… earlier output truncated …", style="dim"))
+        self.append_text(text)
+
+    def append_prompt(self, prompt: str) -> None:
+        self.write(Text(f"▶ {prompt}", style="cyan"))
+
+    def append_text(self, text: str) -> None:
+        """Append text that may mix ANSI tool lines with markdown replies."""
         if not text:
             return
         for segment in _split_segments(text):
@@ -33,33 +38,42 @@ class OutputPanel(RichLog):
             elif segment.strip():
                 self.write(Markdown(segment))
 
-    def append_text(self, text: str) -> None:
-        if not text:
-            return
-        if _has_ansi(text):
-            self.write(Text.from_ansi(text))
-        else:
-            self.write(Markdown(text))
-
 
 def _has_ansi(text: str) -> bool:
-    return bool(_ANSI_RE.search(text))
+    return "\x1b[" in text
 
 
 def _split_segments(text: str) -> list[str]:
-    """Split output into contiguous ANSI vs plain text blocks."""
-    segments: list[str] = []
-    current: list[str] = []
-    current_is_ansi: bool | None = None
+    """Split output into contiguous ANSI vs plain text blocks.
 
-    for line in text.split("\n"):
-        is_ansi = _has_ansi(line)
-        if current_is_ansi is not None and is_ansi != current_is_ansi:
-            segments.append("\n".join(current))
-            current = []
-        current_is_ansi = is_ansi
-        current.append(line)
+    A line belongs to an ANSI block if it contains an escape sequence. Only
+    lines holding an escape are located (via str.find); plain text between
+    them is sliced out whole.
+    """
+    esc = text.find("\x1b[")
+    if esc == -1:
+        return [text]
+
+    segments: list[str] = []
+    plain_start = 0
+    run_start = run_end = -1
+    while esc != -1:
+        line_start = text.rfind("\n", 0, esc) + 1
+        line_end = text.find("\n", esc)
+        if line_end == -1:
+            line_end = len(text)
+        if run_start != -1 and line_start == run_end + 1:
+            run_end = line_end
+        else:
+            if run_start != -1:
+                segments.append(text[run_start:run_end])
+                plain_start = run_end + 1
+            if line_start > plain_start:
+                segments.append(text[plain_start : line_start - 1])
+            run_start, run_end = line_start, line_end
+        esc = text.find("\x1b[", line_end)
 
-    if current:
-        segments.append("\n".join(current))
+    segments.append(text[run_start:run_end])
+    if run_end < len(text):
+        segments.append(text[run_end + 1 :])
     return segments
@@ -7,6 +7,9 @@ from textual.widgets import Input
 if TYPE_CHECKING:
     from ..state.models import Conversation
 
+_READY = "[dim]Ready[/]"
+_IDLE_PREFIX = "[dim]○ Idle[/] │ "
+
 
 class PromptInput(Input):
     """Prompt entry widget. Submit via Enter posts PromptSubmitted message."""
@@ -18,7 +21,9 @@ class PromptInput(Input):
         )
         self._mode = "build"
         self._update_title()
-        self.border_subtitle = "[dim]Ready[/]"
+        # Raw markup last assigned; the border_subtitle getter normalises it.
+        self._status = _READY
+        self.border_subtitle = _READY
 
     def set_mode(self, mode: str) -> None:
         self._mode = mode
@@ -34,11 +39,12 @@ class PromptInput(Input):
 
     def set_status(self, convo: Conversation | None) -> None:
         if convo is None:
-            self.border_subtitle = "[dim]Ready[/]"
-            return
-        elapsed = convo.elapsed()
-        if convo.is_active():
+            status = _READY
+        elif convo.is_active():
             activity = convo.activity or "Working"
-            self.border_subtitle = f"[green]● {activity}[/] │ {elapsed}"
+            status = f"[green]● {activity}[/] │ {convo.elapsed()}"
         else:
-            self.border_subtitle = f"[dim]○ Idle[/] │ {elapsed}"
+            status = _IDLE_PREFIX + convo.elapsed()
+        if status != self._status:
+            self._status = status
+            self.border_subtitle = status
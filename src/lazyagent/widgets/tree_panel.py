@@ -1,12 +1,23 @@
 from __future__ import annotations
 
 from textual.widgets import Tree
+from textual.widgets.tree import NodeID, TreeNode
 
-from ..state.models import AppState, Conversation
+from ..state.models import AppState, Conversation, Project, Status
 
+_STATUS_PREFIX = {
+    Status.RUNNING: "[green][R][/] ",
+    Status.IDLE: "[dim][I][/] ",
+    Status.ERROR: "[red][E][/] ",
+}
+_LABEL_FMT = "%s%s [dim](%s)[/]"
 
-class TreePanel(Tree[str]):
-    """Project/conversation tree with vim-style navigation."""
+
+class TreePanel(Tree[tuple[str, str]]):
+    """Project/conversation tree with vim-style navigation.
+
+    Node data is a ("proj", path) or ("convo", id) tuple.
+    """
 
     BORDER_TITLE = "Projects"
 
@@ -14,70 +25,90 @@ class TreePanel(Tree[str]):
         super().__init__("Projects", id="tree-panel")
         self.show_root = False
         self.guide_depth = 2
+        # Node data -> (inputs, label) so labels are only re-formatted when
+        # status, text or elapsed change.
+        self._label_cache: dict[tuple[str, str], tuple[tuple, str]] = {}
+        # Label string each node currently shows, so unchanged labels are
+        # never re-set.
+        self._shown_labels: dict[NodeID, str] = {}
 
     def rebuild(self, state: AppState) -> None:
         """Full rebuild — only call on structural changes (add/remove/expand)."""
         self.clear()
+        self._shown_labels.clear()
+        # Drops entries for deleted convos; rebuilds are rare enough.
+        self._label_cache.clear()
         selected_convo = state.selected_conversation()
 
         for proj in state.projects:
-            arrow = "▾" if proj.expanded else "▸"
+            label = self._project_label(proj)
             proj_node = self.root.add(
-                f"{arrow} {proj.name}",
-                data=f"proj:{proj.path}",
+                label,
+                data=("proj", proj.path),
                 expand=proj.expanded,
             )
+            self._shown_labels[proj_node.id] = label
 
             if proj.expanded:
                 for convo in proj.convos:
-                    label = _build_convo_label(convo)
-                    node = proj_node.add_leaf(label, data=f"convo:{convo.id}")
+                    label = self._convo_label(convo)
+                    node = proj_node.add_leaf(label, data=("convo", convo.id))
+                    self._shown_labels[node.id] = label
 
                     if selected_convo and convo.id == selected_convo.id:
                         self.select_node(node)
 
     def update_labels(self, state: AppState) -> None:
         """In-place label update — no clear(), preserves cursor and scroll."""
-        for proj_node in self.root.children:
-            proj_data = proj_node.data or ""
-            proj_path = proj_data.split(":", 1)[1] if ":" in proj_data else ""
-            proj = next((p for p in state.projects if p.path == proj_path), None)
-            if proj is None:
-                continue
-
-            arrow = "▾" if proj.expanded else "▸"
-            proj_node.set_label(f"{arrow} {proj.name}")
-
-            for convo_node in proj_node.children:
-                convo_data = convo_node.data or ""
-                convo_id = convo_data.split(":", 1)[1] if ":" in convo_data else ""
-                convo = next((c for c in proj.convos if c.id == convo_id), None)
-                if convo is None:
+        # One repaint for the whole pass instead of one per changed label.
+        with self.app.batch_update():
+            for proj_node in self.root.children:
+                if proj_node.data is None:
+                    continue
+                proj = state.projects_by_path.get(proj_node.data[1])
+                if proj is None:
                     continue
-                convo_node.set_label(_build_convo_label(convo))
+
+                self._set_label(proj_node, self._project_label(proj))
+
+                for convo_node in proj_node.children:
+                    if convo_node.data is None:
+                        continue
+                    convo = proj.convos_by_id.get(convo_node.data[1])
+                    if convo is None:
+                        continue
+                    self._set_label(convo_node, self._convo_label(convo))
+
+    def _project_label(self, proj: Project) -> str:
+        data = ("proj", proj.path)
+        key = (proj.expanded, proj.name)
+        cached = self._label_cache.get(data)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        arrow = "▾" if proj.expanded else "▸"
+        label = f"{arrow} {proj.name}"
+        self._label_cache[data] = (key, label)
+        return label
+
+    def _convo_label(self, convo: Conversation) -> str:
+        data = ("convo", convo.id)
+        key = (convo.status, convo.title or convo.prompt, convo.elapsed())
+        cached = self._label_cache.get(data)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        display = convo.title
+        if not display:
+            display = convo.prompt.split("\n", 1)[0]
+            if len(display) > 20:
+                display = display[:19] + "…"
+        label = _LABEL_FMT % (_STATUS_PREFIX[convo.status], display, key[2])
+        self._label_cache[data] = (key, label)
+        return label
+
+    def _set_label(self, node: TreeNode[tuple[str, str]], label: str) -> None:
+        if self._shown_labels.get(node.id) != label:
+            node.set_label(label)
+            self._shown_labels[node.id] = label
 
     def on_mount(self) -> None:
         self.show_guides = False
-
-
-def _build_convo_label(convo: Conversation) -> str:
-    status_color = {
-        "R": "[green]",
-        "I": "[dim]",
-        "E": "[red]",
-    }.get(convo.status.value, "[dim]")
-
-    display = convo.title if convo.title else _truncate(convo.prompt, 20)
-
-    return (
-        f"{status_color}[{convo.status.value}][/] "
-        f"{display} "
-        f"[dim]({convo.elapsed()})[/]"
-    )
-
-
-def _truncate(s: str, max_len: int) -> str:
-    s = s.split("\n")[0]
-    if len(s) > max_len:
-        return s[: max_len - 1] + "…"
-    return s
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from lazyagent.state import persist
+
+
+@pytest.fixture
+def state_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point persist at a temp dir instead of ~/.local/state/lazyagent."""
+    monkeypatch.setattr(persist, "_STATE_DIR", tmp_path)
+    monkeypatch.setattr(persist, "_LOGS_DIR", tmp_path / "logs")
+    monkeypatch.setattr(persist, "_STATE_PATH", tmp_path / "state.json")
+    return tmp_path
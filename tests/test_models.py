@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import pytest
+
+from lazyagent.state.models import Conversation, project_name
+
+
+def _convo(*chunks: str) -> Conversation:
+    return Conversation(id="c", prompt="p", output_chunks=list(chunks))
+
+
+@pytest.mark.parametrize(
+    ("chunks", "max_chars", "expected"),
+    [
+        ((), 10, ("", False)),
+        (("ab", "cd"), 10, ("abcd", False)),
+        # Exactly max_chars is not a truncation.
+        (("ab", "cd"), 4, ("abcd", False)),
+        # The cut lands on a line start, so the whole line is kept.
+        (("line1\n", "line2\n", "line3"), 11, ("line2\nline3", True)),
+        # Mid-line cuts skip ahead to the next line.
+        (("line1\n", "line2\n", "line3"), 8, ("line3", True)),
+        (("line1\nli", "ne2\nline3"), 10, ("line3", True)),
+        # No newline in the window: keep exactly max_chars.
+        (("abcdefgh",), 3, ("fgh", True)),
+    ],
+)
+def test_output_tail(
+    chunks: tuple[str, ...], max_chars: int, expected: tuple[str, bool]
+) -> None:
+    assert _convo(*chunks).output_tail(max_chars) == expected
+
+
+def test_output_tail_stays_within_limit() -> None:
+    convo = _convo(*(f"line {i}\n" for i in range(100)))
+    text, truncated = convo.output_tail(50)
+    assert truncated
+    assert len(text) <= 50
+    assert convo.output.endswith(text)
+    assert text.startswith("line ")
+
+
+@pytest.mark.parametrize(
+    ("path", "name"),
+    [("/a/proj", "proj"), ("/a/proj/", "proj"), ("proj", "proj"), ("/", "/")],
+)
+def test_project_name(path: str, name: str) -> None:
+    assert project_name(path) == name
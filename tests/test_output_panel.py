@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from lazyagent.widgets.output_panel import _has_ansi, _split_segments
+
+RED = "\x1b[31m"
+
+
+def _reference_split(text: str) -> list[str]:
+    """The original line-by-line splitter _split_segments must match."""
+    segments: list[str] = []
+    current: list[str] = []
+    current_is_ansi: bool | None = None
+    for line in text.split("\n"):
+        is_ansi = _has_ansi(line)
+        if current_is_ansi is not None and is_ansi != current_is_ansi:
+            segments.append("\n".join(current))
+            current = []
+        current_is_ansi = is_ansi
+        current.append(line)
+    if current:
+        segments.append("\n".join(current))
+    return segments
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "plain",
+        "\n",
+        "\n\n",
+        "plain\n",
+        "\nplain",
+        f"{RED}red",
+        f"\n{RED}red",
+        f"{RED}red\n",
+        f"\n{RED}red\n",
+        f"{RED}first\nplain\nplain",
+        f"plain\nplain\n{RED}last",
+        f"{RED}a\n{RED}b",
+        f"{RED}a\n{RED}b\nplain\n{RED}c",
+        f"plain\n\n{RED}a\n\nplain",
+        f"{RED}a{RED}b\n{RED}c",
+        "lone \x1b without bracket\n[",
+    ],
+)
+def test_split_matches_reference(text: str) -> None:
+    segments = _split_segments(text)
+    assert segments == _reference_split(text)
+    assert "\n".join(segments) == text
+
+
+def test_split_matches_reference_random() -> None:
+    rng = random.Random(0)
+    alphabet = ["a", " ", "\n", "\n", "\x1b[", "\x1b", "["]
+    for _ in range(5000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 16)))
+        assert _split_segments(text) == _reference_split(text), repr(text)
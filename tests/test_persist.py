@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+from lazyagent.state import persist
+from lazyagent.state.models import AppState, Conversation, Project, Status
+
+PROJECT = "/work/proj"
+
+
+def _state_with_convo() -> tuple[AppState, Conversation]:
+    state = AppState(projects=[Project(path=PROJECT, name="proj")])
+    convo = state.new_conversation("hello")
+    assert convo is not None
+    convo.output_chunks = ["first\n"]
+    return state, convo
+
+
+def _reload(convo_id: str) -> tuple[AppState, Conversation]:
+    state = persist.load_state(PROJECT)
+    convo = state.projects_by_path[PROJECT].convos_by_id[convo_id]
+    assert not convo.output_loaded
+    persist.ensure_output(convo)
+    return state, convo
+
+
+def test_log_appends_then_reloads(state_dir: Path) -> None:
+    state, convo = _state_with_convo()
+    persist.save_state(state)
+    convo.output_chunks += ["second\n", "third\n"]
+    persist.save_state(state)
+    # A save with nothing new leaves the log alone.
+    persist.save_state(state)
+
+    log = state_dir / "logs" / f"{convo.id}.log"
+    assert log.read_text() == "first\nsecond\nthird\n"
+
+    state, reloaded = _reload(convo.id)
+    assert reloaded.output == "first\nsecond\nthird\n"
+
+    # Appending after a reload extends the log rather than replacing it.
+    reloaded.output_chunks.append("fourth\n")
+    persist.save_state(state)
+    assert _reload(convo.id)[1].output == "first\nsecond\nthird\nfourth\n"
+
+
+def test_log_rewritten_when_output_shrinks(state_dir: Path) -> None:
+    state, convo = _state_with_convo()
+    convo.output_chunks += ["second\n"]
+    persist.save_state(state)
+    convo.output_chunks = ["reset\n"]
+    persist.save_state(state)
+    assert _reload(convo.id)[1].output == "reset\n"
+
+
+def test_unloaded_log_is_not_touched(state_dir: Path) -> None:
+    state, convo = _state_with_convo()
+    persist.save_state(state)
+    state = persist.load_state(PROJECT)
+    persist.save_state(state)
+    assert _reload(convo.id)[1].output == "first\n"
+
+
+def test_deleted_convo_log_is_not_recreated(state_dir: Path) -> None:
+    state, convo = _state_with_convo()
+    state.delete_selected_conversation()
+    persist.delete_log(convo.id)
+    # A save that still holds the convo must skip it once it left the project.
+    persist._save_log(state.projects[0], convo)
+    assert not (state_dir / "logs" / f"{convo.id}.log").exists()
+
+
+def test_load_legacy_start_time(state_dir: Path) -> None:
+    (state_dir / "state.json").write_text(
+        json.dumps(
+            {
+                "selected_project": 0,
+                "projects": [
+                    {
+                        "path": PROJECT,
+                        "name": "proj",
+                        "expanded": True,
+                        "conversations": [
+                            {
+                                "id": "abc123",
+                                "prompt": "old",
+                                "status": "R",
+                                "start_time": "2024-01-02T03:04:05",
+                            },
+                            {
+                                "id": "def456",
+                                "prompt": "unknown status",
+                                "status": "?",
+                                "start_ts": 1700000000.0,
+                            },
+                        ],
+                    }
+                ],
+            }
+        )
+    )
+    state = persist.load_state(PROJECT)
+    old, other = state.projects_by_path[PROJECT].convos
+    assert old.start_ts == datetime.fromisoformat("2024-01-02T03:04:05").timestamp()
+    # A convo left running at exit loads as idle.
+    assert old.status is Status.IDLE
+    assert other.start_ts == 1700000000.0
+    assert other.status is Status.IDLE